@@ -1,9 +1,8 @@
-"""Benchmarking the new regex implementation against the old one."""
+"""Benchmarking the word index implementations against each other."""
 
 import argparse
 import time
-from words import Words
-from words.words_regex import WordsRegexSet
+from words import Words, WordsRegexSet, WordsSqlite
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description=
@@ -12,22 +11,29 @@ if __name__ == "__main__":
                         help='Path to words.txt file')
     parser.add_argument('--regexes', type=str, default='regexes.txt',
                         help='Path to file containing regexes, one per line')
+    parser.add_argument('--database', type=str, default=None,
+                        help='Path to the SQLite database (default: words file + .sqlite3)')
     args = parser.parse_args()
 
     with open(args.regexes, 'r', encoding='utf-8') as f:
         regexes = [line.strip() for line in f if not line.startswith('#')]
 
-    words = Words(args.words, 100, True)
-    start = time.perf_counter()
-    for regex in regexes:
-        result = words.get_words_with_regex(regex, len(regex))
-    end = time.perf_counter()
-    print("----- Search by char -----")
-    print(f"Elapsed: {end - start:.2f} seconds")
-    print("----- Search by regex -----")
-    words_bkp = WordsRegexSet(args.words, 100, True)
-    start_bkp = time.perf_counter()
-    for regex in regexes:
-        result_bkp = words_bkp.get_words_with_regex(regex, len(regex))
-    end_bkp = time.perf_counter()
-    print(f"Elapsed: {end_bkp - start_bkp:.2f} seconds")
+    backends = [
+        ("Search by char", lambda: Words(args.words, 100, True)),
+        ("Search by regex", lambda: WordsRegexSet(args.words, 100, True)),
+        ("Search by SQLite", lambda: WordsSqlite(args.words, 100, True, args.database)),
+    ]
+    for name, create in backends:
+        print(f"----- {name} -----")
+        start_load = time.perf_counter()
+        words = create()
+        start = time.perf_counter()
+        for regex in regexes:
+            result = words.get_words_with_regex(regex, len(regex))
+        end = time.perf_counter()
+        print(f"Loaded: {start - start_load:.2f} seconds")
+        print(f"Elapsed: {end - start:.2f} seconds")
+        start_count = time.perf_counter()
+        for regex in regexes:
+            count = words.count_words_with_regex(regex, len(regex))
+        print(f"Count elapsed: {time.perf_counter() - start_count:.2f} seconds")
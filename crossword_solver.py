@@ -1,8 +1,11 @@
 """A class to fill a crossword with fixed schema"""
 
 import logging
+from dataclasses import dataclass
 from models import CellSlot, Crossword, CrosswordSchema, WrittenWord
 from crossword_state import CrosswordState
+from trace_recorder import TraceRecorder
+from transposition_table import TranspositionTable, ZobristHasher
 from word_scorer import WordScorer
 from words import Words
 
@@ -10,20 +13,79 @@ from words import Words
 CANDIDATE_WORDS = 100
 RANDOMIZE_CANDIDATES = True
 
+
+@dataclass(frozen=True)
+class SolverOptions:
+    """
+    Tuning options for the CrosswordSolver.
+    A transposition_table_size of 0 disables the transposition table, a trace_path
+    enables the recording of the search tree to that file. With more than one worker the
+    search tree is split among processes, each searching work_budget nodes at a time.
+    Words in used_words are never written, as if they were already in the grid.
+    """
+    transposition_table_size: int = 0
+    transposition_policy: str = 'lru'
+    trace_path: str | None = None
+    workers: int = 1
+    work_budget: int = 1000
+    used_words: frozenset[str] = frozenset()
+
+    def __post_init__(self):
+        if self.workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+        if self.work_budget < 1:
+            raise ValueError("The work budget must be at least 1 node.")
+
+
+@dataclass
+class SearchProgress:
+    """
+    Bookkeeping of a search: the nodes visited, the candidates pruned as duplicates,
+    during a bounded search the number of visited nodes at which to suspend it, and the
+    version of the word list the transposition table was filled with.
+    """
+    iterations: int = 0
+    duplicates_pruned: int = 0
+    node_limit: int | None = None
+    words_version: int = 0
+
+
+class SearchSuspended(Exception):
+    """
+    Raised when a bounded search runs out of nodes, carrying the states left unexplored.
+    """
+
+    def __init__(self, pending: list[CrosswordState]):
+        super().__init__("Node budget exhausted")
+        self.pending = pending
+
+
 class CrosswordSolver:
     """
     Solves a crossword puzzle using backtracking and candidate word scoring.
+    A word is never used twice: words already in the grid are excluded from the
+    candidates and from the crossing counts, and candidates completing a crossing word
+    equal to themselves or to another completed crossing are pruned.
     """
 
-    def __init__(self, words: Words, schema: CrosswordSchema):
+    def __init__(self, words: Words, schema: CrosswordSchema,
+                 options: SolverOptions | None = None):
         """
         Initialize the solver with a Words object and a CrosswordSchema.
         :param words: Words object containing the word list.
         :param schema: CrosswordSchema object representing the crossword grid.
+        :param options: SolverOptions, defaults are used if None.
         """
         self.schema = schema
         self.words = words
-        self.iterations = 0
+        self.options = options if options is not None else SolverOptions()
+        self.progress = SearchProgress()
+        self.zobrist = ZobristHasher()
+        self.transposition_table: TranspositionTable | None = None
+        if self.options.transposition_table_size > 0:
+            self.transposition_table = TranspositionTable(
+                self.options.transposition_table_size, self.options.transposition_policy)
+        self.trace: TraceRecorder | None = None
 
     def solve(self) -> Crossword:
         """
@@ -31,13 +93,75 @@ class CrosswordSolver:
         :return: A solved Crossword object.
         :raises ValueError: If no solution is found.
         """
-        initial_state = CrosswordState.create_initial_state(self.schema)
-        final_state = self._solve(initial_state)
+        initial_state = CrosswordState.create_initial_state(self.schema, self.options.used_words)
+        if self.options.trace_path is not None:
+            self.trace = TraceRecorder(self.options.trace_path, self.schema)
+        final_state = None
+        try:
+            final_state = self._solve(initial_state)
+        finally:
+            if self.trace is not None:
+                self.trace.close(final_state is not None)
+                self.trace = None
         if final_state is None:
             raise ValueError('No solution found')
-        logging.info("Total iterations: %s", self.iterations)
+        logging.info("Total iterations: %s", self.progress.iterations)
+        if self.transposition_table is not None:
+            logging.info("Transposition table: %d hits / %d probes (%.1f%%), %d entries",
+                         self.transposition_table.hits, self.transposition_table.probes,
+                         100 * self.transposition_table.hit_rate(),
+                         len(self.transposition_table))
         return final_state.get_crossword()
 
+    def stats(self) -> dict[str, int | float]:
+        """
+        Returns the statistics of the search so far.
+        """
+        stats: dict[str, int | float] = {'iterations': self.progress.iterations,
+                                         'duplicates_pruned': self.progress.duplicates_pruned}
+        if self.transposition_table is not None:
+            stats['tt_probes'] = self.transposition_table.probes
+            stats['tt_hits'] = self.transposition_table.hits
+            stats['tt_hit_rate'] = self.transposition_table.hit_rate()
+            stats['tt_entries'] = len(self.transposition_table)
+            stats['tt_evictions'] = self.transposition_table.evictions
+        return stats
+
+    def is_solved(self, crossword_state: CrosswordState) -> bool:
+        """
+        Checks whether no slot is left to fill after the given state.
+        :param crossword_state: The CrosswordState to check.
+        """
+        crossword = crossword_state.get_crossword()
+        return crossword.get_next_available_coordinate(crossword_state.last_coordinate) is None
+
+    def expand(self, crossword_state: CrosswordState) -> list[CrosswordState]:
+        """
+        Returns the states reached by writing each candidate of the next slot, best first.
+        :param crossword_state: The CrosswordState to expand.
+        :return: List of child states, empty if the state is solved or has no candidates.
+        """
+        self.progress.iterations += 1
+        crossword = crossword_state.get_crossword()
+        candidates = self._get_next_candidates(crossword_state) or []
+        return [self._new_state(crossword, crossword_state, candidate) for candidate in candidates]
+
+    def solve_subtree(self, crossword_state: CrosswordState, node_budget: int
+                      ) -> tuple[CrosswordState | None, list[CrosswordState]]:
+        """
+        Searches the subtree of a state, visiting at most node_budget nodes.
+        :param crossword_state: The root of the subtree.
+        :param node_budget: Maximum number of nodes to visit.
+        :return: The solution, if found, and the states left unexplored when the budget
+          runs out; together they cover the rest of the subtree.
+        """
+        self.progress.node_limit = self.progress.iterations + node_budget
+        try:
+            return self._solve(crossword_state), []
+        except SearchSuspended as suspended:
+            return None, suspended.pending
+        finally:
+            self.progress.node_limit = None
 
     def _solve(self, crossword_state: CrosswordState) -> CrosswordState | None:
         """
@@ -45,10 +169,104 @@ class CrosswordSolver:
         :param crosswordState: The current CrosswordState.
         :return: A solved CrosswordState or None if no solution is found.
         """
-        self.iterations += 1
-        if crossword_state.get_crossword().get_next_available_coordinate(
-            crossword_state.last_coordinate) is None:
+        progress = self.progress
+        if progress.node_limit is not None and progress.iterations >= progress.node_limit:
+            raise SearchSuspended([crossword_state])
+        progress.iterations += 1
+        depth = len(crossword_state.written_words)
+        crossword = crossword_state.get_crossword()
+        next_coordinate = crossword.get_next_available_coordinate(crossword_state.last_coordinate)
+        if next_coordinate is None:
+            if self.trace is not None:
+                self.trace.solved(depth)
             return crossword_state
+        # Slots are always filled in the same order, so the depth determines which slots
+        # are complete; the rest of the search depends only on the open cells and on the
+        # used words, which are both in the hash.
+        table_key = (crossword_state.zobrist_hash, depth)
+        if self._is_known_failure(table_key, depth):
+            return None
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        if debug:
+            self._log_position(crossword_state)
+        next_candidates = self._get_next_candidates(crossword_state)
+        if self.trace is not None:
+            self.trace.node(depth, next_coordinate, len(next_candidates))
+        for index, candidate in enumerate(next_candidates):
+            if self.trace is not None:
+                self.trace.attempt(depth, index, candidate)
+            next_state = self._new_state(crossword, crossword_state, candidate)
+            if debug:
+                logging.debug("Evaluating candidate %s - Score %d", candidate.word, candidate.score)
+                next_state.get_crossword().display()
+            try:
+                solution = self._solve(next_state)
+            except SearchSuspended as suspended:
+                suspended.pending.extend(self._new_state(crossword, crossword_state, sibling)
+                                         for sibling in next_candidates[index + 1:])
+                raise
+            if solution is not None:
+                return solution
+        logging.debug("Solution is not valid - discarding")
+        self._record_failure(table_key, depth)
+        return None
+
+    def _is_known_failure(self, table_key: tuple[int, int], depth: int) -> bool:
+        """
+        Checks the transposition table for a partial fill that already failed, recording
+        the skip in the trace. The table is cleared first if the word list changed.
+        :param table_key: Key of the partial fill.
+        :param depth: Depth of the partial fill in the search tree.
+        :return: True if the subtree can be skipped.
+        """
+        if self.transposition_table is None:
+            return False
+        if self.words.version != self.progress.words_version:
+            # Partial fills that failed may have a solution with the new word list
+            self.transposition_table.clear()
+            self.progress.words_version = self.words.version
+        if not self.transposition_table.contains(table_key):
+            return False
+        logging.debug("Partial fill already failed - skipping")
+        if self.trace is not None:
+            self.trace.skip(depth)
+        return True
+
+    def _record_failure(self, table_key: tuple[int, int], depth: int):
+        """
+        Records a partial fill whose subtree has no solution in the trace and in the
+        transposition table.
+        :param table_key: Key of the partial fill.
+        :param depth: Depth of the partial fill in the search tree.
+        """
+        if self.trace is not None:
+            self.trace.backtrack(depth)
+        if self.transposition_table is not None:
+            self.transposition_table.add(table_key)
+
+    def _new_state(self, crossword: Crossword, crossword_state: CrosswordState,
+                   candidate: WrittenWord) -> CrosswordState:
+        """
+        Returns the state reached by writing a candidate, updating the Zobrist hash when
+        the transposition table is enabled.
+        :param crossword: The Crossword of the current state.
+        :param crossword_state: The current CrosswordState.
+        :param candidate: The WrittenWord to write.
+        :return: New CrosswordState.
+        """
+        zobrist_delta = 0
+        if self.transposition_table is not None:
+            zobrist_delta = self.zobrist.word_delta(
+                crossword, crossword.get_slot(candidate.coordinate), candidate.word)
+            for word in {candidate.word, *candidate.completed_words} - crossword_state.used_words:
+                zobrist_delta ^= self.zobrist.used_word_key(word)
+        return crossword_state.new_state(candidate, zobrist_delta)
+
+    def _log_position(self, crossword_state: CrosswordState):
+        """
+        Logs the position of the search, only called when debug logging is enabled.
+        :param crossword_state: The current CrosswordState.
+        """
         if crossword_state.last_coordinate is not None:
             logging.debug("Position %d, %d", crossword_state.last_coordinate.x,
                           crossword_state.last_coordinate.y)
@@ -58,16 +276,6 @@ class CrosswordSolver:
             logging.debug("Searching for Candidates - Word %s", crossword_state.written_words[-1])
         else:
             logging.debug("Searching initial candidate")
-        next_candidates = self._get_next_candidates(crossword_state)
-        for candidate in next_candidates:
-            logging.debug("Evaluating candidate %s - Score %d", candidate.word, candidate.score)
-            next_state = crossword_state.new_state(candidate)
-            next_state.get_crossword().display()
-            solution = self._solve(next_state)
-            if solution is not None:
-                return solution
-        logging.debug("Solution is not valid - discarding")
-        return None
 
     def _get_next_candidates(self, state: CrosswordState) -> list[WrittenWord]:
         """
@@ -80,14 +288,18 @@ class CrosswordSolver:
         if next_coordinate is None:
             return None
         slot = crossword.get_slot(next_coordinate)
-        available_words = self.get_available_words(slot)
-        word_scorer = WordScorer(crossword, slot, self.words)
+        available_words = self.get_available_words(slot, state.used_words)
+        word_scorer = WordScorer(crossword, slot, self.words, state.used_words)
         written_words_by_score: dict[int, list[str]] = {}
         for word in available_words:
             score = word_scorer.score_word(word)
-            written_word = WrittenWord(word, next_coordinate, score)
             if score < 0:
                 continue
+            completed_words = tuple(word_scorer.get_completed_words(word))
+            if completed_words and len(set(completed_words + (word,))) <= len(completed_words):
+                self.progress.duplicates_pruned += 1
+                continue
+            written_word = WrittenWord(word, next_coordinate, score, completed_words)
             if score not in written_words_by_score:
                 written_words_by_score[score] = []
             written_words_by_score[score].append(written_word)
@@ -100,12 +312,14 @@ class CrosswordSolver:
                     return result
         return result
 
-    def get_available_words(self, slot: CellSlot) -> list[str]:
+    def get_available_words(self, slot: CellSlot,
+                            used_words: frozenset[str] = frozenset()) -> list[str]:
         """
         Returns available words for a given slot using regex matching.
         :param slot: The CellSlot to fill.
+        :param used_words: Words already in the crossword, excluded by the word index.
         :return: List of available words.
         """
         regex = slot.get_regex()
-        available_words = self.words.get_words_with_regex(regex, slot.length())
+        available_words = self.words.get_words_with_regex(regex, slot.length(), used_words)
         return available_words
@@ -1,6 +1,8 @@
 """Represents a crossword during the solving algorithm"""
 
-from models import Crossword, CrosswordSchema, CoordinateWithDirection, WrittenWord
+from models import Crossword, CrosswordSchema, CoordinateWithDirection, Direction, WrittenWord
+
+EncodedState = tuple[int, tuple[tuple[str, int, int, int, int], ...], tuple[str, ...]]
 
 class CrosswordState:
     """
@@ -8,25 +10,34 @@ class CrosswordState:
     """
 
     def __init__(self, schema: CrosswordSchema, last_coordinate: CoordinateWithDirection,
-                 written_words: list[WrittenWord]):
+                 written_words: list[WrittenWord], zobrist_hash: int = 0,
+                 used_words: frozenset[str] = frozenset()):
         """
         Initialize a CrosswordState.
         :param schema: The crossword schema.
         :param last_coordinate: The last coordinate used.
         :param written_words: List of WrittenWord objects written so far.
+        :param zobrist_hash: Zobrist hash of the written cells still in an incomplete slot
+          and of the used words.
+        :param used_words: Words complete in the grid, written or formed by crossings.
         """
         self.schema = schema
         self.last_coordinate = last_coordinate
         self.written_words = written_words
+        self.zobrist_hash = zobrist_hash
+        self.used_words = used_words
 
     @staticmethod
-    def create_initial_state(schema: CrosswordSchema):
+    def create_initial_state(schema: CrosswordSchema,
+                             used_words: frozenset[str] = frozenset()):
         """
         Create the initial crossword state from a schema.
         :param schema: The crossword schema.
+        :param used_words: Words used elsewhere, for example in other regions of the grid,
+          that the solver must not write.
         :return: CrosswordState with no words written.
         """
-        return CrosswordState(schema, None, [])
+        return CrosswordState(schema, None, [], used_words=used_words)
 
     def score(self) -> int:
         """
@@ -44,13 +55,43 @@ class CrosswordState:
             crossword.write_word(written_word.word, slot)
         return crossword
 
-    def new_state(self, word: WrittenWord):
+    def new_state(self, word: WrittenWord, zobrist_delta: int = 0):
         """
         Returns a new CrosswordState with the given word added.
         :param word: The WrittenWord to add.
+        :param zobrist_delta: Value to XOR into the Zobrist hash when writing word.
         :return: New CrosswordState.
         """
         new_words = self.written_words.copy()
         new_words.append(word)
-        new_state = CrosswordState(self.schema, word.coordinate, new_words)
+        new_state = CrosswordState(self.schema, word.coordinate, new_words,
+                                   self.zobrist_hash ^ zobrist_delta,
+                                   self.used_words.union((word.word,), word.completed_words))
         return new_state
+
+    def encode(self) -> EncodedState:
+        """
+        Returns a compact, picklable encoding of the state, without the schema.
+        The last coordinate is not stored, since it is the one of the last written word.
+        """
+        return (self.zobrist_hash,
+                tuple((written_word.word, written_word.coordinate.x, written_word.coordinate.y,
+                       written_word.coordinate.direction.value, written_word.score)
+                      for written_word in self.written_words),
+                tuple(self.used_words))
+
+    @staticmethod
+    def decode(schema: CrosswordSchema, encoded: EncodedState):
+        """
+        Rebuilds a state from its encoding.
+        :param schema: The crossword schema.
+        :param encoded: The value returned by encode.
+        :return: The decoded CrosswordState.
+        """
+        zobrist_hash, encoded_words, used_words = encoded
+        written_words = [
+            WrittenWord(word, CoordinateWithDirection(x, y, Direction(direction)), score)
+            for word, x, y, direction, score in encoded_words]
+        last_coordinate = written_words[-1].coordinate if written_words else None
+        return CrosswordState(schema, last_coordinate, written_words, zobrist_hash,
+                              frozenset(used_words))
@@ -4,8 +4,10 @@ import argparse
 import logging
 import time
 from models import CrosswordSchema
-from crossword_solver import CrosswordSolver
-from words import Words
+from crossword_solver import SolverOptions
+from region_solver import RegionSolver
+from transposition_table import REPLACEMENT_POLICIES
+from words import Words, WordsFileWatcher, WordsRegexSet, WordsSqlite
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description=
@@ -14,10 +16,30 @@ if __name__ == "__main__":
                         help='Path to words file')
     parser.add_argument('--grid', type=str, default='grid.json',
                         help='Path to grid file')
+    parser.add_argument('--backend', type=str, default='memory',
+                        choices=['memory', 'regex', 'sqlite'],
+                        help='Word index: in-memory sets, regex scan or SQLite database')
+    parser.add_argument('--database', type=str, default=None,
+                        help='Path to the SQLite database (default: words file + .sqlite3)')
+    parser.add_argument('--watch-words', action='store_true',
+                        help='Apply changes of the words file while solving')
     parser.add_argument('--candidate-words-count', type=int, default=10,
                         help='Number of candidate words to consider per slot')
     parser.add_argument('--randomize', type=bool, default=True,
                         help='Whether to randomize the word list')
+    parser.add_argument('--transposition-table-size', type=int, default=0,
+                        help='Max number of failed partial fills to remember (0 disables)')
+    parser.add_argument('--transposition-policy', type=str, default='lru',
+                        choices=REPLACEMENT_POLICIES,
+                        help='Replacement policy of the transposition table')
+    parser.add_argument('--trace', type=str, default=None,
+                        help='Path of a file where the search tree is recorded')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of processes sharing the search tree of each region')
+    parser.add_argument('--work-budget', type=int, default=1000,
+                        help='Nodes searched by a worker before handing back unexplored branches')
+    parser.add_argument('--region-processes', type=int, default=1,
+                        help='Number of processes solving independent regions of the grid')
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -25,12 +47,30 @@ if __name__ == "__main__":
     import json
     with open(args.grid, 'r', encoding='utf-8') as f:
         grid = json.load(f)
-    words = Words(args.words, args.candidate_words_count, args.randomize)
     schema = CrosswordSchema(grid)
+    if args.backend == 'sqlite':
+        words = WordsSqlite(args.words, args.candidate_words_count, args.randomize, args.database)
+    elif args.backend == 'regex':
+        words = WordsRegexSet(args.words, args.candidate_words_count, args.randomize)
+    else:
+        words = Words(args.words, args.candidate_words_count, args.randomize,
+                      schema.get_slot_lengths())
 
-    solver = CrosswordSolver(words, schema)
+    options = SolverOptions(transposition_table_size=args.transposition_table_size,
+                            transposition_policy=args.transposition_policy,
+                            trace_path=args.trace,
+                            workers=args.workers,
+                            work_budget=args.work_budget)
+    solver = RegionSolver(words, schema, options, args.region_processes)
+    watcher = WordsFileWatcher(words) if args.watch_words else None
+    if watcher is not None:
+        watcher.start()
     start_time = time.perf_counter()
-    crossword = solver.solve()
+    try:
+        crossword = solver.solve()
+    finally:
+        if watcher is not None:
+            watcher.stop()
     end_time = time.perf_counter()
     elapsed_time = end_time - start_time
     crossword.display()
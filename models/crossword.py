@@ -40,6 +40,18 @@ class Crossword:
                 raise ValueError("Cannot write a word over a black square.")
             self.grid[grid_cell.x][grid_cell.y] = value
 
+    def get_words(self) -> set[str]:
+        """
+        Returns the words written in the complete slots of the grid.
+        :return: Set of words.
+        """
+        words = set()
+        for slot in self.schema.get_slots():
+            word = ''.join(self.grid[coordinate.x][coordinate.y] for coordinate in slot)
+            if ' ' not in word:
+                words.add(word)
+        return words
+
     def display(self):
         """
         Displays the current state of the crossword grid to the console.
@@ -1,6 +1,8 @@
 """Represents the schema of a crossword"""
 
 from dataclasses import dataclass
+from .constants import MIN_WORD_LENGTH
+from .coordinate import Coordinate
 
 
 @dataclass()
@@ -12,3 +14,28 @@ class CrosswordSchema:
     def __post_init__(self):
         self.x_length = len(self.grid)
         self.y_length = len(self.grid[0])
+
+    def get_slots(self) -> list[list[Coordinate]]:
+        """
+        Returns the cells of every horizontal and vertical slot of the grid.
+        :return: List of slots, each one a list of coordinates.
+        """
+        slots = []
+        runs = [[Coordinate(x, y) for y in range(self.y_length)] for x in range(self.x_length)]
+        runs += [[Coordinate(x, y) for x in range(self.x_length)] for y in range(self.y_length)]
+        for line in runs:
+            current: list[Coordinate] = []
+            for coordinate in line + [None]:
+                if coordinate is not None and self.grid[coordinate.x][coordinate.y] != '#':
+                    current.append(coordinate)
+                    continue
+                if len(current) >= MIN_WORD_LENGTH:
+                    slots.append(current)
+                current = []
+        return slots
+
+    def get_slot_lengths(self) -> set[int]:
+        """
+        Returns the lengths of the slots of the grid, i.e. the word lengths it needs.
+        """
+        return {len(slot) for slot in self.get_slots()}
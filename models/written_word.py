@@ -7,7 +7,9 @@ from .coordinate_with_direction import CoordinateWithDirection
 class WrittenWord:
     """
     Represents a word written in the crossword, with its coordinate and score.
+    completed_words holds the crossing words that writing it completes.
     """
     word: str
     coordinate: CoordinateWithDirection
     score: int
+    completed_words: tuple[str, ...] = ()
@@ -0,0 +1,146 @@
+"""Splits the search tree of a crossword among a pool of processes"""
+
+import dataclasses
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from models import Crossword, CrosswordSchema
+from crossword_solver import CrosswordSolver, SolverOptions
+from crossword_state import CrosswordState, EncodedState
+from words import Words
+
+SPLIT_FACTOR = 4
+
+_WORKER_SOLVER: CrosswordSolver | None = None
+
+
+def _init_worker(words: Words, schema: CrosswordSchema, options: SolverOptions):
+    """
+    Creates the solver of the worker process, reused by every task it runs.
+    :param words: Words object containing the word list.
+    :param schema: CrosswordSchema object representing the crossword grid.
+    :param options: SolverOptions of the worker solver.
+    """
+    global _WORKER_SOLVER  # pylint: disable=global-statement
+    _WORKER_SOLVER = CrosswordSolver(words, schema, options)
+
+
+def _search(encoded: EncodedState, node_budget: int
+            ) -> tuple[EncodedState | None, list[EncodedState], dict[str, int]]:
+    """
+    Searches a subtree in a worker process.
+    :param encoded: The encoded root of the subtree.
+    :param node_budget: Maximum number of nodes to visit.
+    :return: The encoded solution or None, the encoded states left unexplored and the
+      statistics of the task.
+    """
+    before = _WORKER_SOLVER.stats()
+    state = CrosswordState.decode(_WORKER_SOLVER.schema, encoded)
+    solution, pending = _WORKER_SOLVER.solve_subtree(state, node_budget)
+    after = _WORKER_SOLVER.stats()
+    stats = {key: after[key] - before[key]
+             for key in ('iterations', 'duplicates_pruned', 'tt_probes', 'tt_hits')
+             if key in after}
+    return (solution.encode() if solution is not None else None,
+            [pending_state.encode() for pending_state in pending], stats)
+
+
+def create_solver(words: Words, schema: CrosswordSchema, options: SolverOptions | None = None
+                  ) -> 'CrosswordSolver | ParallelSolver':
+    """
+    Returns the solver matching the number of workers of the options.
+    :param words: Words object containing the word list.
+    :param schema: CrosswordSchema object representing the crossword grid.
+    :param options: SolverOptions of the solver.
+    """
+    if options is not None and options.workers > 1:
+        return ParallelSolver(words, schema, options)
+    return CrosswordSolver(words, schema, options)
+
+
+class ParallelSolver:
+    """
+    Solves a crossword splitting the search tree among worker processes.
+
+    The top levels of the tree are expanded into independent subproblems. Each task
+    searches a subtree for at most work_budget nodes, then hands the branches it did not
+    explore back to the queue, so that idle workers take over the unexplored parts of
+    large subtrees. Each worker has its own transposition table.
+    """
+
+    def __init__(self, words: Words, schema: CrosswordSchema, options: SolverOptions):
+        """
+        Initialize the ParallelSolver.
+        :param words: Words object containing the word list.
+        :param schema: CrosswordSchema object representing the crossword grid.
+        :param options: SolverOptions, with the number of workers and the work budget.
+        """
+        self.words = words
+        self.schema = schema
+        if options.trace_path is not None:
+            logging.warning("Search traces are not recorded by the parallel solver")
+        self.options = dataclasses.replace(options, trace_path=None)
+        self.totals: dict[str, int] = {'iterations': 0, 'duplicates_pruned': 0, 'tasks': 0}
+
+    def solve(self) -> Crossword:
+        """
+        Attempts to solve the crossword puzzle.
+        :return: A solved Crossword object.
+        :raises ValueError: If no solution is found.
+        """
+        splitter = CrosswordSolver(self.words, self.schema, self.options)
+        frontier = [CrosswordState.create_initial_state(self.schema, self.options.used_words)]
+        final_state = None
+        while frontier and len(frontier) < self.options.workers * SPLIT_FACTOR:
+            final_state = next((state for state in frontier if splitter.is_solved(state)), None)
+            if final_state is not None:
+                break
+            frontier = [child for state in frontier for child in splitter.expand(state)]
+        self.totals['iterations'] += splitter.progress.iterations
+        self.totals['duplicates_pruned'] += splitter.progress.duplicates_pruned
+        if final_state is None and frontier:
+            logging.info("Search tree split into %d subproblems", len(frontier))
+            final_state = self._search(frontier)
+        if final_state is None:
+            raise ValueError('No solution found')
+        logging.info("Total iterations: %s", self.totals['iterations'])
+        logging.info("Parallel search: %d tasks on %d workers",
+                     self.totals['tasks'], self.options.workers)
+        return final_state.get_crossword()
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Returns the statistics of the search so far, summed over all the workers.
+        """
+        stats: dict[str, int | float] = dict(self.totals)
+        if stats.get('tt_probes'):
+            stats['tt_hit_rate'] = stats['tt_hits'] / stats['tt_probes']
+        return stats
+
+    def _search(self, frontier: list[CrosswordState]) -> CrosswordState | None:
+        """
+        Searches the subtrees of the frontier in the process pool.
+        :param frontier: The roots of the subtrees, best first.
+        :return: A solved CrosswordState or None if no subtree has a solution.
+        """
+        worker_options = dataclasses.replace(self.options, workers=1)
+        executor = ProcessPoolExecutor(max_workers=self.options.workers,
+                                       initializer=_init_worker,
+                                       initargs=(self.words, self.schema, worker_options))
+        pending = [state.encode() for state in reversed(frontier)]
+        running: set[Future] = set()
+        try:
+            while pending or running:
+                while pending and len(running) < 2 * self.options.workers:
+                    running.add(executor.submit(_search, pending.pop(), self.options.work_budget))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    solution, unexplored, stats = future.result()
+                    self.totals['tasks'] += 1
+                    for key, value in stats.items():
+                        self.totals[key] = self.totals.get(key, 0) + value
+                    if solution is not None:
+                        return CrosswordState.decode(self.schema, solution)
+                    pending.extend(reversed(unexplored))
+            return None
+        finally:
+            executor.shutdown(cancel_futures=True)
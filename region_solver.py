@@ -0,0 +1,252 @@
+"""Splits a crossword into independent regions and solves them separately"""
+
+import dataclasses
+import logging
+import multiprocessing
+import os
+from models import Coordinate, Crossword, CrosswordSchema
+from crossword_solver import SolverOptions
+from parallel_solver import create_solver
+from words import Words
+
+_WORKER_WORDS: Words | None = None
+
+
+def find_regions(schema: CrosswordSchema) -> list[set[Coordinate]]:
+    """
+    Finds the connected components of the slot-crossing graph, i.e. the groups of cells
+    that can be filled without affecting each other.
+    :param schema: The crossword schema.
+    :return: List of regions, each one the set of its cells, in grid order.
+    """
+    parents: dict[Coordinate, Coordinate] = {}
+
+    def find(coordinate: Coordinate) -> Coordinate:
+        root = parents.setdefault(coordinate, coordinate)
+        while root != parents[root]:
+            root = parents[root]
+        while coordinate != root:
+            parents[coordinate], coordinate = root, parents[coordinate]
+        return root
+
+    for slot in schema.get_slots():
+        root = find(slot[0])
+        for coordinate in slot[1:]:
+            parents[find(coordinate)] = root
+    regions: dict[Coordinate, set[Coordinate]] = {}
+    for coordinate in parents:
+        regions.setdefault(find(coordinate), set()).add(coordinate)
+    return sorted(regions.values(), key=lambda region: min((c.x, c.y) for c in region))
+
+
+def get_region_schema(schema: CrosswordSchema, region: set[Coordinate]) -> CrosswordSchema:
+    """
+    Returns a schema where every cell outside the region is a black square.
+    :param schema: The crossword schema.
+    :param region: The cells of the region.
+    :return: The CrosswordSchema of the region.
+    """
+    grid = [[schema.grid[x][y] if Coordinate(x, y) in region else '#'
+             for y in range(schema.y_length)] for x in range(schema.x_length)]
+    return CrosswordSchema(grid)
+
+
+def _init_worker(words: Words):
+    """
+    Stores the word list in the worker process, so that it is not sent with every task.
+    :param words: Words object containing the word list.
+    """
+    global _WORKER_WORDS  # pylint: disable=global-statement
+    _WORKER_WORDS = words
+
+
+def _solve_region(task: tuple[int, CrosswordSchema, SolverOptions]
+                  ) -> tuple[int, tuple[Crossword, dict[str, int | float]]]:
+    """
+    Solves a region in a worker process.
+    :param task: The index, the schema and the SolverOptions of the region.
+    :return: The index of the region, with the solved Crossword and the solver statistics.
+    """
+    index, schema, options = task
+    solver = create_solver(_WORKER_WORDS, schema, options)
+    crossword = solver.solve()
+    return index, (crossword, solver.stats())
+
+
+class RegionSolver:
+    """
+    Solves a crossword by splitting it into regions that share no crossing cells,
+    so that a failure in one region never backtracks through words of another one.
+    Regions solved sequentially exclude the words of the regions solved before them;
+    regions solved in parallel that repeat a word of another region are solved again
+    afterwards, excluding the words of all the other regions. If a region cannot be
+    filled without the words of the others, the grid is solved as a whole instead.
+    """
+
+    def __init__(self, words: Words, schema: CrosswordSchema,
+                 options: SolverOptions | None = None, processes: int = 1):
+        """
+        Initialize the RegionSolver.
+        :param words: Words object containing the word list.
+        :param schema: CrosswordSchema object representing the crossword grid.
+        :param options: SolverOptions used for every region.
+        :param processes: Number of processes solving regions in parallel (1 solves them
+          sequentially in this process). Regions solved in separate processes search
+          their tree with a single worker.
+        """
+        self.words = words
+        self.schema = schema
+        self.options = options if options is not None else SolverOptions()
+        self.processes = processes
+        self.region_stats: list[dict[str, int | float]] = []
+
+    def solve(self) -> Crossword:
+        """
+        Solves every region and merges the results.
+        :return: A solved Crossword object.
+        :raises ValueError: If a region, or the whole grid, has no solution.
+        """
+        regions = find_regions(self.schema)
+        logging.info("Grid split into %d independent regions", len(regions))
+        if len(regions) <= 1:
+            return self._solve_whole_grid()
+        schemas = [get_region_schema(self.schema, region) for region in regions]
+        options = [self._get_region_options(index) for index in range(len(regions))]
+        if self.processes > 1:
+            results = self._solve_conflicts(schemas, options,
+                                            self._solve_in_processes(schemas, options))
+        else:
+            results = self._solve_sequentially(schemas, options)
+        if results is None:
+            logging.info("Regions cannot be filled without repeating words - "
+                         "solving the whole grid")
+            return self._solve_whole_grid()
+        self.region_stats = [stats for _, stats in results]
+        crossword = Crossword(self.schema)
+        for region, (region_crossword, _) in zip(regions, results):
+            for cell in region:
+                crossword.grid[cell.x][cell.y] = region_crossword.grid[cell.x][cell.y]
+        return crossword
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Returns the statistics of all the regions, summed.
+        """
+        total: dict[str, int | float] = {}
+        for stats in self.region_stats:
+            for key, value in stats.items():
+                total[key] = total.get(key, 0) + value
+        if total.get('tt_probes'):
+            total['tt_hit_rate'] = total['tt_hits'] / total['tt_probes']
+        total['regions'] = len(self.region_stats)
+        return total
+
+    def _get_region_options(self, index: int) -> SolverOptions:
+        """
+        Returns the options of a region, giving each region its own trace file.
+        :param index: Index of the region.
+        :return: SolverOptions of the region.
+        """
+        if self.options.trace_path is None:
+            return self.options
+        root, extension = os.path.splitext(self.options.trace_path)
+        return dataclasses.replace(self.options, trace_path=f"{root}.region{index}{extension}")
+
+    def _solve_in_processes(self, schemas: list[CrosswordSchema], options: list[SolverOptions]
+                            ) -> list[tuple[Crossword, dict[str, int | float]]]:
+        """
+        Solves the regions in a pool of processes.
+        :param schemas: The schemas of the regions.
+        :param options: The SolverOptions of the regions.
+        :return: The solved Crossword and statistics of every region, in order.
+        :raises ValueError: If a region has no solution.
+        """
+        tasks = [(index, schema, dataclasses.replace(region_options, workers=1))
+                 for index, (schema, region_options) in enumerate(zip(schemas, options))]
+        results: list[tuple[Crossword, dict[str, int | float]] | None] = [None] * len(tasks)
+        # Results arrive as the regions finish, so the first failure is raised at once, and
+        # leaving the block terminates the processes of the regions still running
+        with multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                  initargs=(self.words,)) as pool:
+            for index, result in pool.imap_unordered(_solve_region, tasks):
+                results[index] = result
+        return results
+
+    def _solve_whole_grid(self) -> Crossword:
+        """
+        Solves the grid in a single search.
+        :return: A solved Crossword object.
+        :raises ValueError: If no solution is found.
+        """
+        solver = create_solver(self.words, self.schema, self.options)
+        crossword = solver.solve()
+        self.region_stats = [solver.stats()]
+        return crossword
+
+    def _solve_sequentially(self, schemas: list[CrosswordSchema], options: list[SolverOptions]
+                            ) -> list[tuple[Crossword, dict[str, int | float]]] | None:
+        """
+        Solves the regions one after the other in this process, each one excluding the
+        words of the regions solved before it.
+        :param schemas: The schemas of the regions.
+        :param options: The SolverOptions of the regions.
+        :return: The solved Crossword and statistics of every region, in order, or None if
+          a region has no solution only because of the words of the previous ones.
+        :raises ValueError: If a region has no solution on its own.
+        """
+        results = []
+        used_words: set[str] = set()
+        for schema, region_options in zip(schemas, options):
+            try:
+                results.append(self._solve_locally(schema, region_options,
+                                                   frozenset(used_words)))
+            except ValueError:
+                if not used_words:
+                    raise
+                return None
+            used_words |= results[-1][0].get_words()
+        return results
+
+    def _solve_locally(self, schema: CrosswordSchema, options: SolverOptions,
+                       used_words: frozenset[str]) -> tuple[Crossword, dict[str, int | float]]:
+        """
+        Solves a region in this process.
+        :param schema: The schema of the region.
+        :param options: The SolverOptions of the region.
+        :param used_words: Words of other regions, not to be used again.
+        :return: The solved Crossword and the solver statistics.
+        :raises ValueError: If the region has no solution.
+        """
+        solver = create_solver(self.words, schema,
+                               dataclasses.replace(options, used_words=used_words))
+        return solver.solve(), solver.stats()
+
+    def _solve_conflicts(self, schemas: list[CrosswordSchema], options: list[SolverOptions],
+                         results: list[tuple[Crossword, dict[str, int | float]]]
+                         ) -> list[tuple[Crossword, dict[str, int | float]]] | None:
+        """
+        Solves again the regions that repeat a word of another region, excluding the words
+        of all the other regions, so that the merged grid never uses a word twice.
+        :param schemas: The schemas of the regions.
+        :param options: The SolverOptions of the regions.
+        :param results: The solved Crossword and statistics of every region, in order.
+        :return: The results without repeated words, or None if a region has no solution
+          without the words of the others.
+        """
+        results = list(results)
+        region_words = [crossword.get_words() for crossword, _ in results]
+        for index, schema in enumerate(schemas):
+            other_words = frozenset().union(*(words for other, words in enumerate(region_words)
+                                              if other != index))
+            if region_words[index].isdisjoint(other_words):
+                continue
+            logging.info("Region %d repeats words of another region - solving it again", index)
+            try:
+                crossword, stats = self._solve_locally(schema, options[index], other_words)
+            except ValueError:
+                return None
+            previous_stats = results[index][1]
+            results[index] = (crossword, {key: previous_stats.get(key, 0) + value
+                                          for key, value in stats.items()})
+            region_words[index] = crossword.get_words()
+        return results
@@ -0,0 +1,136 @@
+"""Offline analysis and replay of the search traces written by the solver."""
+
+import argparse
+import heapq
+import re
+from collections import Counter
+from models import (Crossword, CrosswordSchema, CoordinateWithDirection, Direction,
+                    WrittenWord)
+from crossword_state import CrosswordState
+from trace_recorder import read_trace
+
+
+def _format_slot(slot: tuple[int, int, int]) -> str:
+    x, y, direction = slot
+    return f"({x}, {y}) {Direction(direction).name.lower()}"
+
+
+# pylint: disable=too-many-locals,too-many-branches
+def report(file_path: str, top: int):
+    """
+    Prints the branching factor per depth, the slots filled most often and the
+    slowest subtrees of a trace.
+    :param file_path: Path of the trace file.
+    :param top: Number of hotspots and subtrees to show.
+    """
+    nodes_by_depth: Counter[int] = Counter()
+    tries_by_depth: Counter[int] = Counter()
+    time_by_depth: Counter[int] = Counter()
+    tries_by_slot: Counter[tuple[int, int, int]] = Counter()
+    slowest: list[tuple[int, int, tuple[int, int, int]]] = []
+    slots: list[tuple[int, int, int]] = []
+    open_nodes: list[tuple[int, tuple[int, int, int], int]] = []
+    skips = 0
+    end = None
+
+    def close_node(end_time: int):
+        depth, slot, start_time = open_nodes.pop()
+        duration = end_time - start_time
+        time_by_depth[depth] += duration
+        heapq.heappush(slowest, (duration, depth, slot))
+        if len(slowest) > top:
+            heapq.heappop(slowest)
+
+    for event in read_trace(file_path):
+        kind = event['e']
+        if kind == 'node':
+            depth = event['d']
+            slot = tuple(event['s'])
+            del slots[depth:]
+            slots.append(slot)
+            nodes_by_depth[depth] += 1
+            open_nodes.append((depth, slot, event['t']))
+        elif kind == 'try':
+            tries_by_depth[event['d']] += 1
+            tries_by_slot[slots[event['d']]] += 1
+        elif kind == 'fail':
+            close_node(event['t'])
+        elif kind == 'skip':
+            skips += 1
+        elif kind == 'end':
+            end = event
+            while open_nodes:
+                close_node(event['t'])
+
+    print("----- Summary -----")
+    print(f"Nodes: {sum(nodes_by_depth.values())}, candidates tried: "
+          f"{sum(tries_by_depth.values())}, transposition skips: {skips}")
+    if end is not None:
+        print(f"Solved: {end['ok']}, elapsed: {end['t'] / 1e9:.2f} seconds")
+    print("----- Branching factor per depth -----")
+    for depth in sorted(nodes_by_depth):
+        print(f"Depth {depth:3d}: {nodes_by_depth[depth]:8d} nodes, "
+              f"{tries_by_depth[depth] / nodes_by_depth[depth]:6.2f} tries/node, "
+              f"{time_by_depth[depth] / 1e9:8.2f} s in subtrees")
+    print("----- Thrash hotspots -----")
+    for slot, count in tries_by_slot.most_common(top):
+        print(f"{_format_slot(slot)}: filled {count} times")
+    print("----- Slowest subtrees -----")
+    for duration, depth, slot in sorted(slowest, reverse=True):
+        print(f"{_format_slot(slot)} at depth {depth}: {duration / 1e9:.3f} seconds")
+
+
+def replay(file_path: str, show_steps: bool) -> Crossword | None:
+    """
+    Rebuilds the states visited by the solver, in order, checking that every
+    candidate fits the grid it was written into.
+    :param file_path: Path of the trace file.
+    :param show_steps: Whether to display the grid after every candidate.
+    :return: The solved Crossword, or None if the trace has no solution.
+    :raises ValueError: If the trace is not consistent.
+    """
+    states: list[CrosswordState] = []
+    coordinates: list[CoordinateWithDirection] = []
+    solution = None
+    for event in read_trace(file_path):
+        kind = event['e']
+        if kind == 'start':
+            states = [CrosswordState.create_initial_state(CrosswordSchema(event['grid']))]
+        elif kind == 'node':
+            x, y, direction = event['s']
+            del coordinates[event['d']:]
+            coordinates.append(CoordinateWithDirection(x, y, Direction(direction)))
+        elif kind == 'try':
+            depth = event['d']
+            coordinate = coordinates[depth]
+            slot = states[depth].get_crossword().get_slot(coordinate)
+            if not re.fullmatch(slot.get_regex(), event['w']):
+                raise ValueError(f"Word '{event['w']}' does not fit slot at depth {depth}.")
+            del states[depth + 1:]
+            states.append(states[depth].new_state(WrittenWord(event['w'], coordinate, event['c'])))
+            if show_steps:
+                states[-1].get_crossword().display()
+        elif kind == 'solved':
+            solution = states[event['d']].get_crossword()
+    return solution
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze or replay a solver trace.")
+    parser.add_argument('command', choices=['report', 'replay'],
+                        help='report: print search statistics, replay: rebuild the search')
+    parser.add_argument('trace', type=str, help='Path to the trace file')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of hotspots and subtrees to report')
+    parser.add_argument('--show-steps', action='store_true',
+                        help='Display the grid after every replayed candidate')
+    args = parser.parse_args()
+
+    if args.command == 'report':
+        report(args.trace, args.top)
+    else:
+        crossword = replay(args.trace, args.show_steps)
+        if crossword is None:
+            print("No solution in trace")
+        else:
+            crossword.display()
@@ -0,0 +1,107 @@
+"""
+Records the search tree explored by the solver as a JSONL event log.
+
+Every line is a JSON object whose 'e' field is the event type:
+- start: {"e": "start", "grid": [[...]]} - the schema being solved
+- node: {"e": "node", "d": depth, "s": [x, y, direction], "n": candidates, "t": ns}
+- try: {"e": "try", "d": depth, "i": index, "w": word, "c": score, "t": ns}
+- skip: {"e": "skip", "d": depth, "t": ns} - partial fill found in the transposition table
+- fail: {"e": "fail", "d": depth, "t": ns} - every candidate of the node failed
+- solved: {"e": "solved", "d": depth, "t": ns}
+- end: {"e": "end", "ok": solved, "t": ns}
+Times are nanoseconds since the start event, depths are the number of written words.
+"""
+
+import json
+import time
+from typing import Generator
+from models import CrosswordSchema, CoordinateWithDirection, WrittenWord
+
+TRACE_BUFFER_SIZE = 1 << 20
+
+
+class TraceRecorder:
+    """
+    Writes search events to a trace file with buffered I/O.
+    """
+
+    def __init__(self, file_path: str, schema: CrosswordSchema):
+        """
+        Initialize the TraceRecorder, writing the start event.
+        :param file_path: Path of the trace file, overwritten if it exists.
+        :param schema: The schema being solved.
+        """
+        self._file = open(file_path, 'w', encoding='utf-8',  # pylint: disable=consider-using-with
+                          buffering=TRACE_BUFFER_SIZE)
+        self._start = time.perf_counter_ns()
+        self._write({'e': 'start', 'grid': schema.grid})
+
+    def node(self, depth: int, coordinate: CoordinateWithDirection, candidates: int):
+        """
+        Records the visit of a node and the slot chosen to be filled.
+        :param depth: Depth of the node.
+        :param coordinate: Coordinate of the slot.
+        :param candidates: Number of candidate words for the slot.
+        """
+        self._write({'e': 'node', 'd': depth,
+                     's': [coordinate.x, coordinate.y, coordinate.direction.value],
+                     'n': candidates, 't': self._elapsed()})
+
+    def attempt(self, depth: int, index: int, candidate: WrittenWord):
+        """
+        Records a candidate word being tried at a node.
+        :param depth: Depth of the node.
+        :param index: Index of the candidate in the candidate list.
+        :param candidate: The candidate WrittenWord.
+        """
+        self._write({'e': 'try', 'd': depth, 'i': index, 'w': candidate.word,
+                     'c': candidate.score, 't': self._elapsed()})
+
+    def skip(self, depth: int):
+        """
+        Records a node skipped because it is known to fail.
+        :param depth: Depth of the node.
+        """
+        self._write({'e': 'skip', 'd': depth, 't': self._elapsed()})
+
+    def backtrack(self, depth: int):
+        """
+        Records a node whose candidates all failed.
+        :param depth: Depth of the node.
+        """
+        self._write({'e': 'fail', 'd': depth, 't': self._elapsed()})
+
+    def solved(self, depth: int):
+        """
+        Records a node where the crossword is complete.
+        :param depth: Depth of the node.
+        """
+        self._write({'e': 'solved', 'd': depth, 't': self._elapsed()})
+
+    def close(self, solved: bool = False):
+        """
+        Writes the end event and closes the trace file.
+        :param solved: Whether a solution was found.
+        """
+        if self._file.closed:
+            return
+        self._write({'e': 'end', 'ok': solved, 't': self._elapsed()})
+        self._file.close()
+
+    def _elapsed(self) -> int:
+        return time.perf_counter_ns() - self._start
+
+    def _write(self, event: dict):
+        self._file.write(json.dumps(event, separators=(',', ':')))
+        self._file.write('\n')
+
+
+def read_trace(file_path: str) -> Generator[dict, None, None]:
+    """
+    Yields the events of a trace file.
+    :param file_path: Path of the trace file.
+    """
+    with open(file_path, 'r', encoding='utf-8', buffering=TRACE_BUFFER_SIZE) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,91 @@
+"""Checks that the transposition table never changes the outcome of a search."""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+from models import CrosswordSchema
+from crossword_solver import CrosswordSolver, SolverOptions
+from words import Words
+
+
+def random_grid(rng: random.Random, x_length: int, y_length: int) -> list[list[str]]:
+    """
+    Returns a grid with about one black square every five cells.
+    :param rng: The random generator.
+    :param x_length: Number of rows.
+    :param y_length: Number of columns.
+    """
+    return [['#' if rng.random() < 0.2 else ' ' for _ in range(y_length)]
+            for _ in range(x_length)]
+
+
+def random_words(rng: random.Random, alphabet: str, max_length: int) -> list[str]:
+    """
+    Returns a random half of the words of every length up to max_length.
+    :param rng: The random generator.
+    :param alphabet: Letters of the words.
+    :param max_length: Maximum word length.
+    """
+    words = [''.join(letters) for length in range(2, max_length + 1)
+             for letters in itertools.product(alphabet, repeat=length)]
+    return rng.sample(words, len(words) // 2)
+
+
+def is_solvable(words: Words, schema: CrosswordSchema, table_size: int) -> bool:
+    """
+    Runs a search and tells whether it found a solution.
+    :param words: Words object containing the word list.
+    :param schema: CrosswordSchema object representing the crossword grid.
+    :param table_size: Size of the transposition table, 0 to disable it.
+    """
+    solver = CrosswordSolver(words, schema, SolverOptions(transposition_table_size=table_size))
+    try:
+        solver.solve()
+    except ValueError:
+        return False
+    return True
+
+
+def check(seed: int, grids: int, alphabet: str) -> int:
+    """
+    Solves random grids with and without the transposition table, printing the grids
+    where the outcomes differ.
+    :param seed: Seed of the random generator.
+    :param grids: Number of grids to check.
+    :param alphabet: Letters of the words.
+    :return: Number of mismatches.
+    """
+    rng = random.Random(seed)
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(grids):
+            length = rng.choice((3, 4))
+            word_list = random_words(rng, alphabet, length)
+            file_path = os.path.join(directory, f"words{index}.txt")
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(word_list) + '\n')
+            words = Words(file_path, 100, False)
+            schema = CrosswordSchema(random_grid(rng, length, length))
+            without_table = is_solvable(words, schema, 0)
+            with_table = is_solvable(words, schema, 10000)
+            if without_table != with_table:
+                mismatches += 1
+                print(f"Mismatch on grid {schema.grid} with words {' '.join(word_list)}: "
+                      f"{without_table} without the table, {with_table} with it")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=
+                                     "Compare searches with and without the transposition table.")
+    parser.add_argument('--seeds', type=int, default=6, help='Number of random seeds')
+    parser.add_argument('--grids', type=int, default=400, help='Number of grids per seed')
+    parser.add_argument('--alphabet', type=str, default='ab', help='Letters of the words')
+    args = parser.parse_args()
+
+    total = sum(check(seed, args.grids, args.alphabet) for seed in range(args.seeds))
+    print(f"{total} mismatches over {args.seeds * args.grids} grids")
+    sys.exit(1 if total else 0)
@@ -0,0 +1,164 @@
+"""A bounded table of partial fills already known to fail"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Hashable
+from models import CellSlot, CoordinateWithDirection, Crossword, Direction, MIN_WORD_LENGTH
+
+REPLACEMENT_POLICIES = ('lru', 'fifo')
+
+
+# pylint: disable=too-few-public-methods
+class ZobristHasher:
+    """
+    Computes Zobrist-style hashes of the crossword contents.
+
+    Every (cell, letter) pair and every word is mapped to a 64-bit key, and the hash of a
+    grid is the XOR of the keys of its open written cells and of its used words, so it
+    can be updated incrementally when a word is written. Keys are derived
+    deterministically, so hashes computed in different processes agree.
+    """
+
+    def __init__(self):
+        self._keys: dict[tuple[int, int, str], int] = {}
+
+    def cell_key(self, x: int, y: int, value: str) -> int:
+        """
+        Returns the key of a letter written in a cell.
+        :param x: Row of the cell.
+        :param y: Column of the cell.
+        :param value: Letter written in the cell.
+        :return: 64-bit key.
+        """
+        key = self._keys.get((x, y, value))
+        if key is None:
+            digest = hashlib.blake2b(f"{x},{y},{value}".encode('utf-8'), digest_size=8).digest()
+            key = int.from_bytes(digest, 'little')
+            self._keys[(x, y, value)] = key
+        return key
+
+    def used_word_key(self, word: str) -> int:
+        """
+        Returns the key of a word used in the grid.
+        :param word: The used word.
+        :return: 64-bit key.
+        """
+        digest = hashlib.blake2b(f"used:{word}".encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+
+    def word_delta(self, crossword: Crossword, slot: CellSlot, word: str) -> int:
+        """
+        Returns the value to XOR into the hash when writing a word in a slot.
+        The hash only covers the open cells: written cells that belong to a slot that is
+        not complete yet. Cells whose slots are all complete no longer constrain the
+        search, so two partial fills that differ only there share the same hash.
+        :param crossword: The Crossword before writing the word.
+        :param slot: The CellSlot being filled.
+        :param word: The word written in the slot.
+        :return: Hash delta.
+        """
+        written = {(cell.x, cell.y): char for cell, char in zip(slot.all_cells(), word)
+                   if cell.value == ' '}
+        crossing_direction = Direction.opposite(slot.direction)
+        affected = {(cell.x, cell.y) for cell in slot.all_cells()}
+        for cell in slot.all_cells():
+            crossing = crossword.get_slot(CoordinateWithDirection(cell.x, cell.y,
+                                                                  crossing_direction))
+            if self._is_complete(crossing, written):
+                affected.update((crossing_cell.x, crossing_cell.y)
+                                for crossing_cell in crossing.all_cells())
+        delta = 0
+        for x, y in affected:
+            open_before = crossword.grid[x][y] != ' ' and not self._is_closed(crossword, x, y, {})
+            open_after = not self._is_closed(crossword, x, y, written)
+            if open_before != open_after:
+                delta ^= self.cell_key(x, y, written.get((x, y), crossword.grid[x][y]))
+        return delta
+
+    def _is_closed(self, crossword: Crossword, x: int, y: int,
+                   written: dict[tuple[int, int], str]) -> bool:
+        """
+        Checks whether every slot through a cell is complete.
+        """
+        return all(self._is_complete(crossword.get_slot(CoordinateWithDirection(x, y, direction)),
+                                     written)
+                   for direction in Direction)
+
+    @staticmethod
+    def _is_complete(slot: CellSlot, written: dict[tuple[int, int], str]) -> bool:
+        """
+        Checks whether a slot is complete once the written letters are added; slots too
+        short for a word count as complete.
+        """
+        if slot.length() < MIN_WORD_LENGTH:
+            return True
+        return all(cell.value != ' ' or (cell.x, cell.y) in written for cell in slot.all_cells())
+
+
+class TranspositionTable:
+    """
+    Remembers the partial fills whose subtree was searched without finding a solution,
+    so the solver does not explore them again when reached through a different path.
+    The table holds at most max_entries keys; when full, an entry is evicted according
+    to the replacement policy ('lru' drops the least recently used entry, 'fifo' the
+    oldest one).
+    """
+
+    def __init__(self, max_entries: int, policy: str = 'lru'):
+        """
+        Initialize the TranspositionTable.
+        :param max_entries: Maximum number of entries kept in memory.
+        :param policy: Replacement policy, one of REPLACEMENT_POLICIES.
+        :raises ValueError: If the size or the policy are not valid.
+        """
+        if max_entries <= 0:
+            raise ValueError("The transposition table size must be positive.")
+        if policy not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy '{policy}'.")
+        self.max_entries = max_entries
+        self.policy = policy
+        self.probes = 0
+        self.hits = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, key: Hashable) -> bool:
+        """
+        Checks whether a partial fill is already known to fail, updating the statistics.
+        :param key: Key of the partial fill.
+        :return: True if the key is in the table.
+        """
+        self.probes += 1
+        if key not in self._entries:
+            return False
+        self.hits += 1
+        if self.policy == 'lru':
+            self._entries.move_to_end(key)
+        return True
+
+    def add(self, key: Hashable):
+        """
+        Records a partial fill that failed, evicting an entry if the table is full.
+        :param key: Key of the partial fill.
+        """
+        if key in self._entries:
+            return
+        if len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        self._entries[key] = None
+
+    def clear(self):
+        """
+        Forgets every partial fill, keeping the statistics.
+        """
+        self._entries.clear()
+
+    def hit_rate(self) -> float:
+        """
+        Returns the fraction of probes that found the key in the table.
+        """
+        return self.hits / self.probes if self.probes > 0 else 0.0
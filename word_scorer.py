@@ -10,17 +10,21 @@ class WordScorer:
     Scores candidate words for a crossword slot based on fitting constraints.
     """
 
-    def __init__(self, crossword: Crossword, slot: CellSlot, words: Words):
+    def __init__(self, crossword: Crossword, slot: CellSlot, words: Words,
+                 excluded: frozenset[str] = frozenset()):
         """
         Initialize the WordScorer.
         :param crossword: The Crossword object.
         :param slot: The CellSlot to score for.
         :param words: The Words object for word lookup.
+        :param excluded: Words already used in the crossword, not counted as fitting.
         """
         self.crossword = crossword
         self.slot = slot
         self.words = words
+        self.excluded = excluded
         self.scorecard = {}
+        self._crossing_slots: list[CellSlot] | None = None
 
     def score_word(self, word: str) -> int:
         """
@@ -33,27 +37,51 @@ class WordScorer:
         if length != len(word):
             raise ValueError("Word length does not match slot length.")
         score = 0
+        crossing_slots = self._get_crossing_slots()
         for i in range(length):
             cell = all_cells[i]
             value_char = word[i]
             fitting_count = self._get_fitting_words_count_for_char(
-                self.crossword, cell, Direction.opposite(self.slot.direction), value_char)
+                crossing_slots[i], cell, value_char)
             if fitting_count < 0:
                 return -1
             score += fitting_count
         return score
 
-    def _get_fitting_words_count_for_char(self, crossword: Crossword,
-                                          cell: Cell, direction: Direction, value: str) -> int:
+    def get_completed_words(self, word: str) -> list[str]:
         """
-        Returns the number of fitting words for a cell and direction with a given value.
-        :param crossword: The Crossword object.
-        :param cell: The Cell to check.
-        :param direction: The direction to check.
+        Returns the crossing words that writing a word in the slot would complete.
+        :param word: The word to write.
+        :return: The completed crossing words.
+        """
+        completed = []
+        for cell, char, slot in zip(self.slot.all_cells(), word, self._get_crossing_slots()):
+            if cell.value != ' ' or slot.length() < MIN_WORD_LENGTH:
+                continue
+            regex = slot.get_tentative_regex(char)
+            if '.' not in regex:
+                completed.append(regex)
+        return completed
+
+    def _get_crossing_slots(self) -> list[CellSlot]:
+        """
+        Returns the slots crossing each cell of the slot, computed once per scorer.
+        """
+        if self._crossing_slots is None:
+            direction = Direction.opposite(self.slot.direction)
+            self._crossing_slots = [
+                self.crossword.get_slot(CoordinateWithDirection(cell.x, cell.y, direction))
+                for cell in self.slot.all_cells()]
+        return self._crossing_slots
+
+    def _get_fitting_words_count_for_char(self, slot: CellSlot, cell: Cell, value: str) -> int:
+        """
+        Returns the number of fitting words for a crossing slot with a given value.
+        :param slot: The crossing CellSlot.
+        :param cell: The Cell shared with the crossing slot.
         :param value: The value to fit.
         :return: Number of fitting words, or -1 if none.
         """
-        slot = crossword.get_slot(CoordinateWithDirection(cell.x, cell.y, direction))
         if slot.is_written():
             logging.debug("Skipping (%d, %d) as it is already written.", cell.x, cell.y)
             return 0
@@ -61,8 +89,9 @@ class WordScorer:
             logging.debug("Skipping (%d, %d) due to insufficient length for word.", cell.x, cell.y)
             return 0
         regex = slot.get_tentative_regex(value)
-        words_list = self.words.get_words_with_regex(regex, slot.length())
-        if len(words_list) == 0:
+        count = self.words.count_words_with_regex(regex, slot.length(), self.excluded,
+                                                  self.words.size)
+        if count == 0:
             logging.debug("No words found for regex '%s' of length %d.", regex, slot.length)
             return -1
-        return len(words_list)
+        return count
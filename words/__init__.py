@@ -2,3 +2,5 @@
 
 from .words_set import Words
 from .words_regex import WordsRegexSet
+from .words_sqlite import WordsSqlite
+from .file_watcher import WordsFileWatcher
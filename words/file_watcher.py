@@ -0,0 +1,83 @@
+"""
+Module for watching a word file and applying its changes to a word index.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+
+class WordsFileWatcher:
+    """
+    Polls a word file in a background thread and, when it changes, applies the
+    difference to a word index through its reload method, so that a running solver
+    sees the new word list without rebuilding the index.
+
+    Attributes:
+        words: The word index, any backend with file_path and reload().
+        interval (float): Seconds between two checks of the file.
+    """
+
+    def __init__(self, words, interval: float = 0.2):
+        """
+        Initializes the watcher, without starting it.
+
+        Args:
+            words: The word index to keep up to date.
+            interval (float): Seconds between two checks of the file.
+        """
+        self.words = words
+        self.interval = interval
+        self._signature = self._get_signature()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        """
+        Starts watching the file in a daemon thread.
+        """
+        self._thread = threading.Thread(target=self._run, name="words-file-watcher",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops watching the file and waits for the thread to end.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """
+        Applies the changes of the file if it was modified since the last check.
+
+        Returns:
+            bool: Whether the word index was reloaded.
+        """
+        signature = self._get_signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        start = time.perf_counter()
+        added, removed = self.words.reload()
+        logging.info("Word list reloaded: %d added, %d removed in %.1f ms",
+                     added, removed, 1000 * (time.perf_counter() - start))
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except (OSError, sqlite3.Error) as error:
+                logging.warning("Cannot reload word list: %s", error)
+
+    def _get_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.words.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
@@ -2,6 +2,7 @@
 
 import random
 import re
+from typing import Iterable
 
 from words.file_reader import read_words_from_file
 
@@ -9,6 +10,8 @@ from words.file_reader import read_words_from_file
 class WordsRegexSet:
     """
     Manages the word list for the crossword, with regex and length-based lookup.
+    The word lists are never changed in place: adding or removing words replaces them
+    with new lists, so that a lookup running in another thread scans a consistent list.
     """
 
     def __init__(self, file_path: str, size: int, randomize: bool):
@@ -20,27 +23,95 @@ class WordsRegexSet:
         """
         self.size = size
         self.randomize = randomize
+        self.file_path = file_path
+        self.version = 0
         self._read_words(file_path)
 
-    def get_words_with_regex(self, regex: str, length: int) -> list[str]:
+    def get_words_with_regex(self, regex: str, length: int,
+                             excluded: frozenset[str] = frozenset()) -> list[str]:
         """
         Returns a list of words matching the regex and length.
         :param regex: Regex pattern to match.
         :param length: Desired word length.
+        :param excluded: Words to leave out.
         :return: List of matching words.
         """
-        all_words = self.words_by_length[length]
+        all_words = self.words_by_length.get(length, [])
         pattern = re.compile(regex)
         result = []
         result_count = 0
         for word in all_words:
-            if pattern.fullmatch(word):
+            if pattern.fullmatch(word) and word not in excluded:
                 result.append(word)
                 result_count += 1
                 if result_count >= self.size:
                     break
         return result
 
+    def count_words_with_regex(self, regex: str, length: int,
+                               excluded: frozenset[str] = frozenset(),
+                               limit: int | None = None) -> int:
+        """
+        Counts the words matching the regex and length.
+        :param regex: Regex pattern to match.
+        :param length: Desired word length.
+        :param excluded: Words not to count.
+        :param limit: Count at which to stop scanning, None to count every match.
+        :return: Number of matching words, at most limit.
+        """
+        pattern = re.compile(regex)
+        count = 0
+        for word in self.words_by_length.get(length, []):
+            if pattern.fullmatch(word) and word not in excluded:
+                count += 1
+                if count == limit:
+                    break
+        return count
+
+    def add_words(self, words: Iterable[str]):
+        """
+        Adds words to the word lists, replacing the lists of the changed lengths.
+        :param words: The words to add.
+        """
+        added_by_length: dict[int, list[str]] = {}
+        for word in words:
+            added_by_length.setdefault(len(word), []).append(word)
+        for length, added in added_by_length.items():
+            word_list = self.words_by_length.get(length, []).copy()
+            for word in added:
+                if self.randomize:
+                    word_list.insert(random.randint(0, len(word_list)), word)
+                else:
+                    word_list.append(word)
+            self.words_by_length[length] = word_list
+        self.version += 1
+
+    def remove_words(self, words: Iterable[str]):
+        """
+        Removes words from the word lists, replacing the lists of the changed lengths.
+        :param words: The words to remove.
+        """
+        removed_by_length: dict[int, set[str]] = {}
+        for word in words:
+            removed_by_length.setdefault(len(word), set()).add(word)
+        for length, removed in removed_by_length.items():
+            if length in self.words_by_length:
+                self.words_by_length[length] = [
+                    word for word in self.words_by_length[length] if word not in removed]
+        self.version += 1
+
+    def reload(self) -> tuple[int, int]:
+        """
+        Applies the changes of the word file to the existing word lists.
+        :return: Number of words added and removed.
+        """
+        file_words = set(read_words_from_file(self.file_path))
+        current = {word for word_list in self.words_by_length.values() for word in word_list}
+        added = file_words - current
+        removed = current - file_words
+        self.add_words(added)
+        self.remove_words(removed)
+        return len(added), len(removed)
 
     def _read_words(self, file_path):
         """
@@ -1,6 +1,8 @@
 """A class to store and retrieve words"""
 
 import random
+import threading
+from typing import Iterable
 
 from words.file_reader import read_words_from_file
 
@@ -47,6 +49,19 @@ class WordsSet:
                 self.words_by_char[i][char] = set()
             self.words_by_char[i][char].add(word)
 
+    def remove_word(self, word: str):
+        """
+        Removes a word from the set and from its character position indexes.
+
+        Args:
+            word (str): The word to remove, ignored if not in the set.
+        """
+        if word not in self.all_words:
+            return
+        self.all_words.discard(word)
+        for i, char in enumerate(word):
+            self.words_by_char[i][char].discard(word)
+
     def get_words(self, pattern: dict[int, str]) -> list[str]:
         """
         Retrieves all words matching a pattern of fixed characters at specific positions.
@@ -74,20 +89,31 @@ class WordsSet:
 class Words:
     """
     Manages the word list for the crossword, with regex and length-based lookup.
+    Lookups and changes of the word list are serialized by a lock, so that words can be
+    added or removed from another thread while solving.
     """
 
-    def __init__(self, file_path: str, size: int, randomize: bool):
+    def __init__(self, file_path: str, size: int, randomize: bool,
+                 lengths: set[int] | None = None):
         """
         Initialize the Words object.
         :param file_path: Path to the word list file.
         :param size: Max number of words to return per query.
         :param randomize: Whether to randomize the word list.
+        :param lengths: Word lengths to index when reading the file, for example the slot
+          lengths of a schema; other lengths are loaded when first requested. All the
+          lengths are indexed if None.
         """
         self.size = size
         self.randomize = randomize
+        self.file_path = file_path
+        self.loaded_lengths = set(lengths) if lengths is not None else None
+        self.version = 0
+        self._lock = threading.Lock()
         self._read_words(file_path)
 
-    def get_words_with_regex(self, regex: str, length: int) -> list[str]:
+    def get_words_with_regex(self, regex: str, length: int,
+                             excluded: frozenset[str] = frozenset()) -> list[str]:
         """
         Retrieves words of a given length matching a regex-like pattern.
 
@@ -95,19 +121,102 @@ class Words:
             regex (str): A string pattern where 
                 fixed letters are specified and other positions are wildcards.
             length (int): The required word length.
+            excluded (frozenset[str]): Words to leave out, removed with a set difference.
 
         Returns:
             list[str]: A list of matching words, possibly randomized and limited in size.
         """
         pattern = self._get_pattern(regex)
-        if length not in self.words_by_length:
-            return []
-        all_words = self.words_by_length[length].get_words(pattern)
+        with self._lock:
+            words_set = self._get_words_set(length)
+            if words_set is None:
+                return []
+            all_words = words_set.get_words(pattern)
+            # A copy, since the sets of the index change when words are added or removed
+            all_words = list(all_words - excluded if excluded else all_words)
         if self.randomize:
-            all_words = list(all_words)
             random.shuffle(all_words)
         return all_words[:self.size] if len(all_words) > self.size else all_words
 
+    def count_words_with_regex(self, regex: str, length: int,
+                               excluded: frozenset[str] = frozenset(),
+                               limit: int | None = None) -> int:
+        """
+        Counts the words of a given length matching a regex-like pattern.
+
+        Args:
+            regex (str): A string pattern where
+                fixed letters are specified and other positions are wildcards.
+            length (int): The required word length.
+            excluded (frozenset[str]): Words not to count.
+            limit (int | None): Maximum count to return, None for no maximum.
+
+        Returns:
+            int: The number of matching words, at most limit.
+        """
+        pattern = self._get_pattern(regex)
+        with self._lock:
+            words_set = self._get_words_set(length)
+            if words_set is None:
+                return 0
+            all_words = words_set.get_words(pattern)
+            count = len(all_words) - len(all_words & excluded)
+        return count if limit is None else min(count, limit)
+
+    def add_words(self, words: Iterable[str]):
+        """
+        Adds words to the index in place.
+        :param words: The words to add.
+        """
+        with self._lock:
+            for word in words:
+                words_set = self._get_words_set(len(word))
+                if words_set is None:
+                    words_set = WordsSet(len(word))
+                    self.words_by_length[len(word)] = words_set
+                words_set.add_word(word)
+            self.version += 1
+
+    def remove_words(self, words: Iterable[str]):
+        """
+        Removes words from the index in place.
+        :param words: The words to remove.
+        """
+        with self._lock:
+            for word in words:
+                words_set = self._get_words_set(len(word))
+                if words_set is not None:
+                    words_set.remove_word(word)
+            self.version += 1
+
+    def reload(self) -> tuple[int, int]:
+        """
+        Applies the changes of the word file to the loaded lengths, without rebuilding
+        the index.
+        :return: Number of words added and removed.
+        """
+        file_words: dict[int, set[str]] = {}
+        for word in read_words_from_file(self.file_path):
+            if self.loaded_lengths is None or len(word) in self.loaded_lengths:
+                file_words.setdefault(len(word), set()).add(word)
+        added = set()
+        removed = set()
+        for length in file_words.keys() | self.words_by_length.keys():
+            words_set = self.words_by_length.get(length)
+            current = words_set.all_words if words_set is not None else set()
+            added |= file_words.get(length, set()) - current
+            removed |= current - file_words.get(length, set())
+        self.add_words(added)
+        self.remove_words(removed)
+        return len(added), len(removed)
+
+    def __getstate__(self):
+        return {key: value for key, value in self.__dict__.items() if key != '_lock'}
+
+    def __setstate__(self, state):
+        state['_lock'] = threading.Lock()
+        self.__dict__.update(state)
+
     def _get_pattern(self, regex: str) -> dict[int, str]:
         pattern: dict[int, str] = {}
         for i, char in enumerate(regex):
@@ -115,14 +224,31 @@ class Words:
                 pattern[i] = char
         return pattern
 
-    def _read_words(self, file_path):
+    def _get_words_set(self, length: int) -> WordsSet | None:
+        """
+        Returns the index of the words of a length, loading it from the file if that
+        length was not indexed yet.
+        :param length: The word length.
+        :return: The WordsSet, or None if the file has no word of that length.
+        """
+        if self.loaded_lengths is not None and length not in self.loaded_lengths:
+            self.loaded_lengths.add(length)
+            self._read_words(self.file_path, {length})
+        return self.words_by_length.get(length)
+
+    def _read_words(self, file_path, lengths: set[int] | None = None):
         """
         Reads words from the file and organizes them by length.
         :param file_path: Path to the word list file.
+        :param lengths: Lengths to read, defaults to the loaded lengths (all if None).
         """
-        self.words_by_length: dict[int, WordsSet] = {}
+        if lengths is None:
+            self.words_by_length: dict[int, WordsSet] = {}
+            lengths = self.loaded_lengths
         for word in read_words_from_file(file_path):
             word_length = len(word)
+            if lengths is not None and word_length not in lengths:
+                continue
             if word_length not in self.words_by_length:
                 self.words_by_length[word_length] = WordsSet(word_length)
             self.words_by_length[word_length].add_word(word)
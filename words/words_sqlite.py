@@ -0,0 +1,512 @@
+"""A class to store and retrieve words from a SQLite database"""
+
+import os
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+from words.file_reader import read_words_from_file
+
+CACHE_SIZE = 4096
+CACHE_POOL_FACTOR = 4
+INSERT_BATCH_SIZE = 10000
+
+
+class QueryCache:
+    """
+    A thread-safe LRU cache of the results of pattern queries, with keys of the form
+    (kind, length, pattern).
+
+    The keys are indexed by the positions and letters fixed by their pattern, so that
+    the entries matching a changed word are found with one lookup per group of
+    positions instead of a scan of the whole cache. Every invalidation bumps a
+    generation counter, so that a query started before the invalidation does not store
+    a result that may already be stale.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize an empty QueryCache.
+        :param max_entries: Maximum number of results kept.
+        """
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: OrderedDict[tuple, list[str] | int] = OrderedDict()
+        self._index: dict[int, dict[tuple[int, ...], dict[tuple[str, ...], set[tuple]]]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, int, str],
+            query: Callable[[], list[str] | int]) -> list[str] | int:
+        """
+        Returns the cached result of a query, running it on a cache miss.
+        :param key: Cache key of the query: its kind, the word length and the pattern.
+        :param query: Function running the query.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            generation = self.generation
+        result = query()
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = result
+                self._index_key(key).add(key)
+                if len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._unindex_key(evicted)
+        return result
+
+    def invalidate(self, words: Iterable[str]):
+        """
+        Drops the cached results whose pattern matches one of the changed words.
+        :param words: The words added or removed.
+        """
+        with self._lock:
+            self.generation += 1
+            stale = set()
+            for word in words:
+                for positions, keys_by_letters in self._index.get(len(word), {}).items():
+                    stale.update(keys_by_letters.get(tuple(word[i] for i in positions), ()))
+            for key in stale:
+                del self._entries[key]
+                self._unindex_key(key)
+
+    def _index_key(self, key: tuple[str, int, str]) -> set[tuple]:
+        """
+        Returns the set of keys sharing the fixed letters of a key, creating it if needed.
+        """
+        _, length, regex = key
+        positions = tuple(i for i, char in enumerate(regex) if char.isalpha())
+        keys_by_letters = self._index.setdefault(length, {}).setdefault(positions, {})
+        return keys_by_letters.setdefault(tuple(regex[i] for i in positions), set())
+
+    def _unindex_key(self, key: tuple[str, int, str]):
+        """
+        Removes a key from the index, dropping the groups left empty.
+        """
+        _, length, regex = key
+        positions = tuple(i for i, char in enumerate(regex) if char.isalpha())
+        keys_by_letters = self._index[length][positions]
+        letters = tuple(regex[i] for i in positions)
+        keys_by_letters[letters].discard(key)
+        if not keys_by_letters[letters]:
+            del keys_by_letters[letters]
+            if not keys_by_letters:
+                del self._index[length][positions]
+
+
+class ConnectionPool:
+    """
+    One SQLite connection per process and thread. Each connection has a TEMP table of
+    the words to exclude from its queries, kept in sync with the last excluded set so
+    that only the words added or dropped since then are written.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize an empty ConnectionPool.
+        :param db_path: Path of the database.
+        """
+        self.db_path = db_path
+        self._connections: dict[tuple[int, int], sqlite3.Connection] = {}
+        self._used_words: dict[tuple[int, int], frozenset[str]] = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connections'] = {}
+        state['_used_words'] = {}
+        return state
+
+    def get(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current process and thread, opening it if needed.
+        """
+        key = (os.getpid(), threading.get_ident())
+        connection = self._connections.get(key)
+        if connection is None:
+            # Only used by this thread, but close() may be called from another one
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connections[key] = connection
+        return connection
+
+    def get_excluding(self, excluded: frozenset[str]) -> sqlite3.Connection:
+        """
+        Returns the connection of the current process and thread, with its TEMP table
+        'used' holding the excluded words.
+        :param excluded: The words to exclude.
+        """
+        connection = self.get()
+        key = (os.getpid(), threading.get_ident())
+        used_words = self._used_words.get(key)
+        if used_words is None:
+            connection.execute("CREATE TEMP TABLE IF NOT EXISTS used (word TEXT PRIMARY KEY)")
+            used_words = frozenset()
+        if used_words is not excluded:
+            connection.executemany("DELETE FROM used WHERE word = ?",
+                                   [(word,) for word in used_words - excluded])
+            connection.executemany("INSERT OR IGNORE INTO used VALUES (?)",
+                                   [(word,) for word in excluded - used_words])
+            connection.commit()
+            self._used_words[key] = excluded
+        return connection
+
+    def close(self):
+        """
+        Closes the connections opened by the current process.
+        """
+        pid = os.getpid()
+        for key in [key for key in self._connections if key[0] == pid]:
+            self._connections.pop(key).close()
+            self._used_words.pop(key, None)
+
+
+class WordsSqlite:
+    """
+    Manages the word list in a local SQLite database, for dictionaries too large to be
+    indexed in memory by every solver process.
+
+    Words of each length are stored in their own table, with one indexed column per
+    letter position. The database is built from the word file the first time and reused
+    while the file is unchanged. Each process (and thread) gets its own connection, and
+    a small LRU cache keeps the results of recent queries. Excluded words are written to
+    a TEMP table of the connection and filtered out by the queries themselves. Words
+    added or removed are written to the database and only the cached queries they match
+    are dropped.
+    """
+
+    def __init__(self, file_path: str, size: int, randomize: bool, db_path: str | None = None):
+        """
+        Initialize the WordsSqlite object.
+        :param file_path: Path to the word list file.
+        :param size: Max number of words to return per query.
+        :param randomize: Whether to randomize the word list.
+        :param db_path: Path of the database, defaults to the word file path + '.sqlite3'.
+        """
+        self.size = size
+        self.randomize = randomize
+        self.file_path = file_path
+        self.db_path = db_path if db_path is not None else file_path + '.sqlite3'
+        self._connections = ConnectionPool(self.db_path)
+        self._cache = QueryCache(CACHE_SIZE)
+        if not self._is_up_to_date(file_path):
+            self._build(file_path)
+        rows = self._connections.get().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'words_%'")
+        self.lengths = {int(name[len('words_'):]) for (name,) in rows}
+
+    @property
+    def version(self) -> int:
+        """
+        Number of changes applied to the word list in this process.
+        """
+        return self._cache.generation
+
+    def get_words_with_regex(self, regex: str, length: int,
+                             excluded: frozenset[str] = frozenset()) -> list[str]:
+        """
+        Retrieves words of a given length matching a regex-like pattern.
+
+        Args:
+            regex (str): A string pattern where
+                fixed letters are specified and other positions are wildcards.
+            length (int): The required word length.
+            excluded (frozenset[str]): Words to leave out, filtered by the query.
+
+        Returns:
+            list[str]: A list of matching words, possibly randomized and limited in size.
+        """
+        if length not in self.lengths:
+            return []
+        if self._count_excluded_matches(regex, length, excluded):
+            # The cached pool may hold excluded words, query the words left instead
+            pool = self._query_words(regex, length, excluding=True)
+        else:
+            pool = self._cache.get(('words', length, regex),
+                                   lambda: self._query_words(regex, length))
+        if self.randomize and len(pool) > self.size:
+            return random.sample(pool, self.size)
+        result = pool[:self.size]
+        if self.randomize:
+            random.shuffle(result)
+        return result
+
+    def count_words_with_regex(self, regex: str, length: int,
+                               excluded: frozenset[str] = frozenset(),
+                               limit: int | None = None) -> int:
+        """
+        Counts the words of a given length matching a regex-like pattern.
+
+        Args:
+            regex (str): A string pattern where
+                fixed letters are specified and other positions are wildcards.
+            length (int): The required word length.
+            excluded (frozenset[str]): Words not to count.
+            limit (int | None): Maximum count to return, None for no maximum.
+
+        Returns:
+            int: The number of matching words, at most limit.
+        """
+        if length not in self.lengths:
+            return 0
+        count = self._cache.get(('count', length, regex),
+                                lambda: self._query_count(regex, length))
+        count -= self._count_excluded_matches(regex, length, excluded)
+        return count if limit is None else min(count, limit)
+
+    def add_words(self, words: Iterable[str]):
+        """
+        Adds words to the database, creating the table of a new length if needed.
+        :param words: The words to add.
+        """
+        rows_by_length: dict[int, list[tuple[str, ...]]] = {}
+        for word in words:
+            rows_by_length.setdefault(len(word), []).append((word, *word))
+        connection = self._connections.get()
+        for length, rows in rows_by_length.items():
+            if length not in self.lengths:
+                self._create_table(connection, length)
+                self._create_indexes(connection, length)
+            self._insert(connection, length, rows)
+        connection.commit()
+        self.lengths |= rows_by_length.keys()
+        self._cache.invalidate(row[0] for rows in rows_by_length.values() for row in rows)
+
+    def remove_words(self, words: Iterable[str]):
+        """
+        Removes words from the database.
+        :param words: The words to remove.
+        """
+        words_by_length: dict[int, list[str]] = {}
+        for word in words:
+            if len(word) in self.lengths:
+                words_by_length.setdefault(len(word), []).append(word)
+        connection = self._connections.get()
+        for length, removed in words_by_length.items():
+            connection.executemany(f"DELETE FROM words_{length} WHERE word = ?",
+                                   [(word,) for word in removed])
+        connection.commit()
+        self._cache.invalidate(word for removed in words_by_length.values() for word in removed)
+
+    def reload(self) -> tuple[int, int]:
+        """
+        Applies the changes of the word file to the database. The file is loaded into a
+        temporary table and only the difference is written to the word tables.
+        :return: Number of words added and removed.
+        """
+        connection = self._connections.get()
+        connection.execute("CREATE TEMP TABLE incoming (word TEXT PRIMARY KEY)")
+        try:
+            batch = []
+            for word in read_words_from_file(self.file_path):
+                batch.append((word,))
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    connection.executemany("INSERT OR IGNORE INTO incoming VALUES (?)", batch)
+                    batch = []
+            connection.executemany("INSERT OR IGNORE INTO incoming VALUES (?)", batch)
+            file_lengths = {length for (length,) in connection.execute(
+                "SELECT DISTINCT length(word) FROM incoming")}
+            added = []
+            removed = []
+            for length in file_lengths | self.lengths:
+                if length not in self.lengths:
+                    added += [word for (word,) in connection.execute(
+                        "SELECT word FROM incoming WHERE length(word) = ?", (length,))]
+                    continue
+                added += [word for (word,) in connection.execute(
+                    "SELECT word FROM incoming WHERE length(word) = ? "
+                    f"AND word NOT IN (SELECT word FROM words_{length})", (length,))]
+                removed += [word for (word,) in connection.execute(
+                    f"SELECT word FROM words_{length} "
+                    "WHERE word NOT IN (SELECT word FROM incoming)")]
+        finally:
+            connection.execute("DROP TABLE incoming")
+        self.add_words(added)
+        self.remove_words(removed)
+        self._write_meta(connection, self.file_path)
+        connection.commit()
+        return len(added), len(removed)
+
+    def close(self):
+        """
+        Closes the connections opened by the current process.
+        """
+        self._connections.close()
+
+    def _count_excluded_matches(self, regex: str, length: int,
+                                excluded: frozenset[str]) -> int:
+        """
+        Counts the excluded words that are in the table and match the pattern, joining
+        the TEMP table of the excluded words with the table of the length.
+        """
+        if not excluded:
+            return 0
+        where, params = self._get_where(regex, length)
+        (count,) = self._connections.get_excluding(excluded).execute(
+            f"SELECT COUNT(*) FROM used CROSS JOIN words_{length} "
+            f"ON words_{length}.word = used.word{where}", params).fetchone()
+        return count
+
+    def _query_words(self, regex: str, length: int, excluding: bool = False) -> list[str]:
+        """
+        Returns a pool of matching words. When randomizing, a pattern with few matches
+        returns all of them, and otherwise the pool gathers windows of size words
+        starting at random rowids within the bounds of the matches, larger than size so
+        that cached results still vary between calls, without sorting the matching rows.
+        When excluding, the words of the TEMP table 'used' are left out.
+        """
+        connection = self._connections.get()
+        where, params = self._get_where(regex, length, excluding)
+        if not self.randomize:
+            return [word for (word,) in connection.execute(
+                f"SELECT word FROM words_{length}{where} LIMIT ?", params + [self.size])]
+        first, last = self._get_rowid_bounds(regex, length)
+        where, params = self._get_where(regex, length, excluding, "rowid BETWEEN ? AND ?")
+        matches = [word for (word,) in connection.execute(
+            f"SELECT word FROM words_{length}{where} LIMIT ?",
+            params + [first, last, self.size * CACHE_POOL_FACTOR + 1])]
+        if len(matches) <= self.size * CACHE_POOL_FACTOR:
+            return matches
+        pool: dict[str, None] = {}
+        for _ in range(CACHE_POOL_FACTOR):
+            start = random.randint(first, last)
+            window: list[str] = []
+            # The window wraps around to the first match when it reaches the last one
+            for low, high in ((start, last), (first, start - 1)):
+                if len(window) < self.size:
+                    window += [word for (word,) in connection.execute(
+                        f"SELECT word FROM words_{length}{where} ORDER BY rowid LIMIT ?",
+                        params + [low, high, self.size - len(window)])]
+            pool.update(dict.fromkeys(window))
+        return list(pool)
+
+    def _get_rowid_bounds(self, regex: str, length: int) -> tuple[int, int]:
+        """
+        Returns rowids bounding the matches of a pattern, the tightest of the rowid
+        ranges of its fixed letters. Each range takes two lookups in the index of its
+        position, while ordering the matches by rowid may scan most of that index when
+        the pattern fixes other letters. The bounds are empty when a letter has no rows.
+        """
+        connection = self._connections.get()
+        bounds = [connection.execute(
+            f"SELECT (SELECT MIN(rowid) FROM words_{length}), "
+            f"(SELECT MAX(rowid) FROM words_{length})").fetchone()]
+        for i, char in enumerate(regex):
+            if char.isalpha():
+                bounds.append(connection.execute(
+                    f"SELECT (SELECT MIN(rowid) FROM words_{length} WHERE c{i} = ?), "
+                    f"(SELECT MAX(rowid) FROM words_{length} WHERE c{i} = ?)",
+                    (char, char)).fetchone())
+        if any(low is None for low, _ in bounds):
+            return 1, 0
+        return max(low for low, _ in bounds), min(high for _, high in bounds)
+
+    def _query_count(self, regex: str, length: int) -> int:
+        where, params = self._get_where(regex, length)
+        (count,) = self._connections.get().execute(
+            f"SELECT COUNT(*) FROM words_{length}{where}", params).fetchone()
+        return count
+
+    @staticmethod
+    def _get_where(regex: str, length: int, excluding: bool = False,
+                   extra_condition: str | None = None) -> tuple[str, list[str]]:
+        """
+        Returns the WHERE clause and its parameters for the fixed letters of a pattern,
+        leaving out the words of the TEMP table 'used' when excluding. An extra condition
+        is appended last, its parameters are left to the caller.
+        """
+        conditions = []
+        params = []
+        for i, char in enumerate(regex):
+            if char.isalpha():
+                conditions.append(f"words_{length}.c{i} = ?")
+                params.append(char)
+        if excluding:
+            conditions.append(
+                f"NOT EXISTS (SELECT 1 FROM used WHERE used.word = words_{length}.word)")
+        if extra_condition is not None:
+            conditions.append(extra_condition)
+        if not conditions:
+            return "", params
+        return " WHERE " + " AND ".join(conditions), params
+
+    def _is_up_to_date(self, file_path: str) -> bool:
+        """
+        Checks whether the database was built from the current version of the word file.
+        :param file_path: Path to the word list file.
+        """
+        if not os.path.exists(self.db_path):
+            return False
+        try:
+            rows = self._connections.get().execute("SELECT key, value FROM meta").fetchall()
+        except sqlite3.DatabaseError:
+            return False
+        stat = os.stat(file_path)
+        return dict(rows) == {'source_size': str(stat.st_size),
+                              'source_mtime_ns': str(stat.st_mtime_ns)}
+
+    def _build(self, file_path: str):
+        """
+        Builds the database from the word file, replacing any previous content.
+        :param file_path: Path to the word list file.
+        """
+        self.close()
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+        connection = self._connections.get()
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        batches: dict[int, list[tuple[str, ...]]] = {}
+        for word in read_words_from_file(file_path):
+            length = len(word)
+            if length not in batches:
+                self._create_table(connection, length)
+                batches[length] = []
+            batches[length].append((word, *word))
+            if len(batches[length]) >= INSERT_BATCH_SIZE:
+                self._insert(connection, length, batches[length])
+                batches[length] = []
+        for length, batch in batches.items():
+            self._insert(connection, length, batch)
+            self._create_indexes(connection, length)
+        connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._write_meta(connection, file_path)
+        connection.commit()
+        self.close()
+
+    @staticmethod
+    def _create_table(connection: sqlite3.Connection, length: int):
+        columns = ", ".join(f"c{i} TEXT" for i in range(length))
+        connection.execute(f"CREATE TABLE words_{length} (word TEXT PRIMARY KEY, {columns})")
+
+    @staticmethod
+    def _create_indexes(connection: sqlite3.Connection, length: int):
+        for i in range(length):
+            connection.execute(f"CREATE INDEX words_{length}_c{i} ON words_{length} (c{i})")
+
+    @staticmethod
+    def _write_meta(connection: sqlite3.Connection, file_path: str):
+        """
+        Stores the size and modification time of the word file the database matches.
+        """
+        stat = os.stat(file_path)
+        connection.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                               [('source_size', str(stat.st_size)),
+                                ('source_mtime_ns', str(stat.st_mtime_ns))])
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, length: int, rows: list[tuple[str, ...]]):
+        placeholders = ", ".join("?" * (length + 1))
+        connection.executemany(f"INSERT OR IGNORE INTO words_{length} VALUES ({placeholders})",
+                               rows)